@@ -19,3 +19,23 @@ def divide(a, b):
     if b == 0:
         raise ZeroDivisionError("Cannot divide by zero")
     return a / b
+
+
+def _divide_unchecked(a, b):
+    """Divide a by b without validating the inputs."""
+    return a / b
+
+
+def __getattr__(name):
+    # divide_fast is a hot-loop variant for callers that have already validated
+    # their inputs. It is built on first access (compiled with Numba when it is
+    # installed) so importing this module never pays Numba's import cost.
+    if name == "divide_fast":
+        try:
+            from numba import njit
+            divide_fast = njit(cache=True)(_divide_unchecked)
+        except ImportError:
+            divide_fast = _divide_unchecked
+        globals()["divide_fast"] = divide_fast
+        return divide_fast
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,18 @@
 """IR processing, validation, and correction for test generation pipeline."""
 
+import ast
 import json
 import math
+import operator
 import importlib
+import functools
+import os
 import sys
 import re
+import pickle
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any, Dict, List, Optional, Tuple
 
 try:
@@ -14,6 +21,218 @@ try:
 except ImportError:
     JSONSCHEMA_AVAILABLE = False
 
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Python float expressions that IRSyntaxFixer rewrites to JSON-compatible strings
+_NAN_RE = re.compile(r"float\(['\"]nan['\"]\)")
+_INF_RE = re.compile(r"float\(['\"]inf['\"]\)")
+_NEG_INF_RE = re.compile(r"float\(['\"]-inf['\"]\)")
+
+
+def _loads(content: str) -> Any:
+    """Parse JSON, preferring orjson and falling back to json for its error details."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass  # stdlib accepts NaN/Infinity tokens and reports line/column
+    return json.loads(content)
+
+
+def _has_nonfinite(obj: Any) -> bool:
+    """Return True if any float in obj is NaN or infinite."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return False
+
+
+def _dump_ir(ir_data: Dict[str, Any], output: Path) -> None:
+    """Write IR JSON with 2-space indent, preferring orjson when it is installed.
+
+    orjson writes NaN/Infinity as null, so IR containing non-finite floats always
+    goes through stdlib json, which keeps them as NaN/Infinity tokens.
+    """
+    if ORJSON_AVAILABLE and not _has_nonfinite(ir_data):
+        try:
+            output.write_bytes(orjson.dumps(ir_data, option=orjson.OPT_INDENT_2))
+            return
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers beyond 64 bits; stdlib json handles them
+    with open(output, "w") as f:
+        json.dump(ir_data, f, indent=2)
+
+
+# Constructor calls on a plain quoted literal, e.g. "float('nan')" or "int('3')"
+_ARG_CALL_RE = re.compile(r"^(float|int|str)\(\s*(['\"])([^'\"\\]*)\2\s*\)$")
+_ARG_CONSTRUCTORS = {"float": float, "int": int, "str": str}
+_ARG_PREFIXES = tuple(f"{name}(" for name in _ARG_CONSTRUCTORS)
+_ARG_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+# Minimum number of cases before an IR marked "parallel": true is spread across processes
+PARALLEL_MIN_CASES = 64
+
+# Approximate number of cases handed to a worker process at a time
+PARALLEL_BATCH_SIZE = 16
+
+# Compiled schema validators keyed by (schema path, mtime) so edits invalidate the cache
+_VALIDATOR_CACHE: Dict[Tuple[str, int], Any] = {}
+
+
+def _compile_schema(schema: Dict[str, Any]) -> Any:
+    """Compile schema into a callable that raises ValidationError for invalid IR.
+
+    Uses fastjsonschema's generated validator as the fast accept path when installed.
+    IR it rejects is re-checked with jsonschema's Draft7Validator when available, whose
+    messages name the innermost failing keyword (e.g. the allowed predicate names)
+    where fastjsonschema only reports the enclosing oneOf. Schemas fastjsonschema
+    cannot compile fall back to Draft7Validator entirely.
+    """
+    validator = jsonschema.Draft7Validator(schema) if JSONSCHEMA_AVAILABLE else None
+
+    def validate_draft7(ir_data):
+        # Report the most relevant error as jsonschema.validate does; validator.validate
+        # would raise the first one, e.g. an opaque oneOf failure
+        e = jsonschema.exceptions.best_match(validator.iter_errors(ir_data))
+        if e is not None:
+            raise ValidationError(f"Schema validation failed: {e.message}\nAt path: {list(e.path)}")
+
+    if FASTJSONSCHEMA_AVAILABLE:
+        try:
+            compiled = fastjsonschema.compile(schema)
+        except fastjsonschema.JsonSchemaDefinitionException:
+            if validator is None:
+                raise
+        else:
+            def validate(ir_data):
+                try:
+                    compiled(ir_data)
+                except fastjsonschema.JsonSchemaValueException as e:
+                    if validator is not None:
+                        validate_draft7(ir_data)
+                    # Drop the leading "data" element and restore list indices to ints,
+                    # so paths read the same as jsonschema's (e.g. ['cases', 0, 'id'])
+                    path = [int(p) if p.isdigit() else p for p in e.path[1:]]
+                    raise ValidationError(f"Schema validation failed: {e.message}\nAt path: {path}")
+            return validate
+
+    jsonschema.Draft7Validator.check_schema(schema)
+    return validate_draft7
+
+
+def _get_schema_validator(schema_path: Path) -> Any:
+    """Return a cached compiled validator for the schema file, building it on first use."""
+    key = (str(schema_path), schema_path.stat().st_mtime_ns)
+    validator = _VALIDATOR_CACHE.get(key)
+    if validator is None:
+        with open(schema_path) as f:
+            schema = json.load(f)
+        validator = _compile_schema(schema)
+        _VALIDATOR_CACHE[key] = validator
+    return validator
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_target(target: str) -> callable:
+    """Resolve target function from module:function specification (cached per spec)."""
+    module_name, func_name = target.split(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, func_name)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_predicate(name: str) -> callable:
+    """Resolve predicate function from name (cached per name)."""
+    if "." in name:
+        module_name, func_name = name.rsplit(".", 1)
+        if module_name == "math":
+            return getattr(math, func_name)
+    raise ValueError(f"Cannot resolve predicate: {name}")
+
+
+def _eval_arg_node(node: ast.AST) -> Any:
+    """Evaluate a constructor-expression AST node built only from literals,
+    arithmetic, and float/int/str calls (e.g. "float(1/3)", "int(7.9)")."""
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _ARG_CONSTRUCTORS:
+        args = [_eval_arg_node(arg) for arg in node.args]
+        kwargs = {kw.arg: _eval_arg_node(kw.value) for kw in node.keywords}
+        return _ARG_CONSTRUCTORS[node.func.id](*args, **kwargs)
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARG_BINOPS:
+        return _ARG_BINOPS[type(node.op)](_eval_arg_node(node.left), _eval_arg_node(node.right))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        operand = _eval_arg_node(node.operand)
+        return +operand if isinstance(node.op, ast.UAdd) else -operand
+    return ast.literal_eval(node)
+
+
+def _call_key_part(value: Any) -> Tuple[type, Any]:
+    """Return a hashable, type- and sign-exact cache key component for one argument."""
+    if isinstance(value, float):
+        return type(value), value.hex()
+    return type(value), value
+
+
+def _batch_by_call(cases: List[Dict[str, Any]], size: int) -> List[List[int]]:
+    """Split case indices into batches of about size, keeping identical calls in one batch."""
+    groups: Dict[str, List[int]] = {}
+    for i, case in enumerate(cases):
+        groups.setdefault(json.dumps(case["call"], sort_keys=True), []).append(i)
+
+    batches, batch = [], []
+    for indices in groups.values():
+        batch.extend(indices)
+        if len(batch) >= size:
+            batches.append(batch)
+            batch = []
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _run_cases(validator: "IRValidator", target: str, cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Validate a batch of cases in a worker process, resolving the target there.
+
+    Identical calls within the batch share one execution. Results travel back to
+    the parent by pickle, so an unpicklable return value (closure, generator, ...)
+    is replaced by its repr.
+    """
+    func = _resolve_target(target)
+    call_cache = {}
+    results = [validator._validate_case(func, case, call_cache) for case in cases]
+    for result in results:
+        if "actual" in result:
+            try:
+                pickle.dumps(result["actual"])
+            except Exception:
+                result["actual"] = repr(result["actual"])
+    return results
+
 
 class IRProcessingError(Exception):
     """Base exception for IR processing errors."""
@@ -42,19 +261,32 @@ class IRProcessor:
         "__false__": lambda: False
     }
 
-    def process_ir(self, ir_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process IR JSON, converting special values."""
-        return self._traverse(ir_data)
+    SPECIAL_KEYS = frozenset(SPECIAL_VALUES)
 
-    def _traverse(self, obj: Any) -> Any:
-        """Recursively traverse and convert special values."""
-        if isinstance(obj, str) and obj in self.SPECIAL_VALUES:
-            return self.SPECIAL_VALUES[obj]()
-        elif isinstance(obj, dict):
-            return {k: self._traverse(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._traverse(item) for item in obj]
-        return obj
+    def process_ir(self, ir_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Process IR JSON in place, converting special values."""
+        if isinstance(ir_data, str) and ir_data in self.SPECIAL_KEYS:
+            return self.SPECIAL_VALUES[ir_data]()
+        self._traverse(ir_data)
+        return ir_data
+
+    def _traverse(self, root: Any) -> None:
+        """Iteratively traverse containers, converting special values in place."""
+        stack = [root]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, dict):
+                items = obj.items()
+            elif isinstance(obj, list):
+                items = enumerate(obj)
+            else:
+                continue
+            for key, value in items:
+                if type(value) is str:
+                    if value in self.SPECIAL_KEYS:
+                        obj[key] = self.SPECIAL_VALUES[value]()
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
 
 
 class IRSyntaxFixer:
@@ -67,9 +299,9 @@ class IRSyntaxFixer:
         Returns: (fixed_content, was_modified)
         """
         original = content
-        content = re.sub(r"float\(['\"]nan['\"]\)", '"NaN"', content)
-        content = re.sub(r"float\(['\"]inf['\"]\)", '"Infinity"', content)
-        content = re.sub(r"float\(['\"]-inf['\"]\)", '"-Infinity"', content)
+        content = _NAN_RE.sub('"NaN"', content)
+        content = _INF_RE.sub('"Infinity"', content)
+        content = _NEG_INF_RE.sub('"-Infinity"', content)
 
         return content, content != original
 
@@ -80,7 +312,7 @@ class IRValidator:
     def __init__(self, tolerance: float = 1e-10):
         self.tolerance = tolerance
 
-    def validate(self, ir_path: Path, target_module: str) -> List[Dict[str, Any]]:
+    def validate(self, ir_path: Path, target_module: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Validate IR test cases against actual function behavior.
 
@@ -89,7 +321,7 @@ class IRValidator:
             target_module: Module path containing the target function
 
         Returns:
-            List of validation results with mismatches
+            Tuple of (parsed IR data, list of validation results with mismatches)
 
         Raises:
             ValidationError: If IR file is invalid or cannot be processed
@@ -102,7 +334,7 @@ class IRValidator:
 
         # Pre-validate JSON syntax with auto-fix for common issues
         try:
-            ir_data = json.loads(content)
+            ir_data = _loads(content)
         except json.JSONDecodeError as e:
             # Attempt to auto-fix Python float expressions
             fixed_content, was_fixed = IRSyntaxFixer.fix_python_float_expressions(content)
@@ -110,7 +342,7 @@ class IRValidator:
             if was_fixed:
                 # Try parsing again after fixes
                 try:
-                    ir_data = json.loads(fixed_content)
+                    ir_data = _loads(fixed_content)
                     # Write the fixed content back to file
                     with open(ir_path, 'w') as f:
                         f.write(fixed_content)
@@ -145,16 +377,13 @@ class IRValidator:
                 raise ValidationError(error_msg)
 
         # Validate against JSON schema if available
-        if JSONSCHEMA_AVAILABLE:
+        if FASTJSONSCHEMA_AVAILABLE or JSONSCHEMA_AVAILABLE:
             schema_path = Path(ir_path).parent.parent / "schemas" / "ir_schema.json"
             if schema_path.exists():
                 try:
-                    with open(schema_path) as f:
-                        schema = json.load(f)
-                    jsonschema.validate(ir_data, schema)
+                    validate_schema = _get_schema_validator(schema_path)
+                    validate_schema(ir_data)
                     print(f"✓ IR structure validated against schema")
-                except jsonschema.ValidationError as e:
-                    raise ValidationError(f"Schema validation failed: {e.message}\nAt path: {list(e.path)}")
                 except json.JSONDecodeError:
                     print("Warning: Invalid schema file, skipping schema validation")
 
@@ -166,24 +395,44 @@ class IRValidator:
         except (ImportError, AttributeError) as e:
             raise ValidationError(f"Cannot resolve target function: {e}")
 
-        mismatches = []
-        for case in ir_data["cases"]:
+        cases = ir_data["cases"]
+        for case in cases:
             if "id" not in case or "call" not in case or "expectation" not in case:
                 raise ValidationError(f"Invalid case structure: {case}")
 
-            result = self._validate_case(func, case)
-            if not result["valid"]:
-                mismatches.append(result)
-
-        return mismatches
+        # Worker processes only pay off for expensive targets, so they are opt-in via
+        # "parallel": true; "pure": false opts out of them and of call reuse, since both
+        # assume calls have no side effects the parent needs to observe
+        pure = ir_data.get("pure", True)
+        parallel = ir_data.get("parallel", False) and len(cases) >= PARALLEL_MIN_CASES
+        if pure and parallel and (os.cpu_count() or 1) > 1:
+            # Cases are independent, so they fan out across worker processes in batches
+            # that keep identical calls together, so each still executes only once
+            batches = _batch_by_call(cases, PARALLEL_BATCH_SIZE)
+            run_cases = functools.partial(_run_cases, self, ir_data["target"])
+            results = [None] * len(cases)
+            try:
+                with ProcessPoolExecutor() as executor:
+                    batch_results = executor.map(run_cases, [[cases[i] for i in batch] for batch in batches])
+                    for batch, batch_result in zip(batches, batch_results):
+                        for i, result in zip(batch, batch_result):
+                            results[i] = result
+            except BrokenProcessPool as e:
+                raise ValidationError(f"Parallel case validation failed: {e}")
+        else:
+            # Identical calls to a pure target share one execution
+            call_cache = {} if pure else None
+            results = [self._validate_case(func, case, call_cache) for case in cases]
+
+        mismatches = [result for result in results if not result["valid"]]
+        return ir_data, mismatches
 
     def _resolve_target(self, target: str, module_path: str) -> callable:
         """Resolve target function from module:function specification."""
-        module_name, func_name = target.split(":")
-        module = importlib.import_module(module_name)
-        return getattr(module, func_name)
+        return _resolve_target(target)
 
-    def _validate_case(self, func: callable, case: Dict[str, Any]) -> Dict[str, Any]:
+    def _validate_case(self, func: callable, case: Dict[str, Any],
+                       call_cache: Optional[Dict[tuple, Tuple[bool, Any]]] = None) -> Dict[str, Any]:
         """Validate a single test case."""
         case_id = case["id"]
         call = case["call"]
@@ -193,7 +442,7 @@ class IRValidator:
         kwargs = self._process_args(call.get("kwargs", {}))
 
         try:
-            actual = func(*args, **kwargs)
+            actual = self._call(func, args, kwargs, call_cache)
             valid, reason = self._check_expectation(actual, expectation)
 
             return {
@@ -225,44 +474,84 @@ class IRValidator:
                 "reason": f"Unexpected exception: {e}"
             }
 
-    def _check_expectation(self, actual: Any, expectation: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-        """Check if actual result matches expectation."""
-        if "raises" in expectation:
-            return False, "Expected exception but function returned normally"
+    def _call(self, func: callable, args: Any, kwargs: Any,
+              call_cache: Optional[Dict[tuple, Tuple[bool, Any]]]) -> Any:
+        """Call func, replaying the outcome of an identical earlier call when call_cache is given.
 
-        if "equals" in expectation:
-            expected_value = expectation["equals"]["value"]
-            tolerance = expectation["equals"].get("tolerance", self.tolerance)
+        Argument types are part of the key so that e.g. 1, 1.0 and True stay distinct,
+        and floats are keyed by their exact hex form so 0.0 and -0.0 do too.
+        Raised exceptions are cached too and re-raised for every matching case.
+        """
+        if call_cache is None:
+            return func(*args, **kwargs)
+        try:
+            key = (tuple(_call_key_part(a) for a in args),
+                   tuple(sorted((k, _call_key_part(v)) for k, v in kwargs.items())))
+            outcome = call_cache.get(key)
+        except TypeError:
+            return func(*args, **kwargs)  # unhashable arguments are never cached
+
+        if outcome is None:
+            try:
+                outcome = (True, func(*args, **kwargs))
+            except Exception as e:
+                outcome = (False, e)
+            call_cache[key] = outcome
+
+        returned, value = outcome
+        if returned:
+            return value
+        raise value
 
-            if isinstance(actual, float) and isinstance(expected_value, (int, float)):
-                if math.isclose(actual, expected_value, abs_tol=tolerance):
-                    return True, None
-                return False, f"Values differ: {actual} != {expected_value}"
+    def _check_expectation(self, actual: Any, expectation: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """Check if actual result matches expectation, dispatching on the first known kind key.
 
-            if actual == expected_value:
+        Kinds are tried in raises, equals, predicate order, as the original if/elif chain did.
+        """
+        kind = next((k for k in self._CHECKERS if k in expectation), None)
+        if kind is None:
+            return False, "No valid expectation type found"
+        return self._CHECKERS[kind](self, actual, expectation[kind])
+
+    def _check_raises(self, actual: Any, spec: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """An exception was expected, so a normal return is always a mismatch."""
+        return False, "Expected exception but function returned normally"
+
+    def _check_equals(self, actual: Any, spec: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """Compare actual against the expected value, with tolerance for floats."""
+        expected_value = spec["value"]
+        tolerance = spec.get("tolerance", self.tolerance)
+
+        if isinstance(actual, float) and isinstance(expected_value, (int, float)):
+            if math.isclose(actual, expected_value, abs_tol=tolerance):
                 return True, None
             return False, f"Values differ: {actual} != {expected_value}"
 
-        if "predicate" in expectation:
-            predicate_name = expectation["predicate"]["name"]
-            predicate = self._resolve_predicate(predicate_name)
+        if actual == expected_value:
+            return True, None
+        return False, f"Values differ: {actual} != {expected_value}"
 
-            if predicate(actual):
-                return True, None
-            return False, f"Predicate {predicate_name} failed for value {actual}"
+    def _check_predicate(self, actual: Any, spec: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """Apply the named predicate to actual."""
+        predicate_name = spec["name"]
+        predicate = self._resolve_predicate(predicate_name)
 
-        return False, "No valid expectation type found"
+        if predicate(actual):
+            return True, None
+        return False, f"Predicate {predicate_name} failed for value {actual}"
+
+    _CHECKERS = {
+        "raises": _check_raises,
+        "equals": _check_equals,
+        "predicate": _check_predicate,
+    }
 
     def _resolve_predicate(self, name: str) -> callable:
         """Resolve predicate function from name."""
-        if "." in name:
-            module_name, func_name = name.rsplit(".", 1)
-            if module_name == "math":
-                return getattr(math, func_name)
-        raise ValueError(f"Cannot resolve predicate: {name}")
+        return _resolve_predicate(name)
 
     def _process_args(self, args: Any) -> Any:
-        """Process arguments, evaluating string expressions and special float values."""
+        """Process arguments, converting constructor expressions and special float values."""
         if isinstance(args, str):
             # Handle special float string values (from JSON-compatible format)
             if args == "NaN":
@@ -272,11 +561,14 @@ class IRValidator:
             if args == "-Infinity":
                 return float('-inf')
 
-            # Try to evaluate string expressions safely
-            if args.startswith(('float(', 'int(', 'str(')):
+            # Convert constructor expressions like float('nan') or float(1/3) without eval
+            if args.startswith(_ARG_PREFIXES):
                 try:
-                    return eval(args, {"__builtins__": {}}, {"float": float, "int": int, "str": str})
-                except:
+                    match = _ARG_CALL_RE.match(args)
+                    if match:
+                        return _ARG_CONSTRUCTORS[match.group(1)](match.group(3))
+                    return _eval_arg_node(ast.parse(args, mode="eval").body)
+                except Exception:
                     return args
             # Handle quoted strings
             if args.startswith('"') and args.endswith('"'):
@@ -311,32 +603,28 @@ class IRCorrector:
             CorrectionError: If correction fails
         """
         try:
-            mismatches = self.validator.validate(ir_path, target_module)
+            ir_data, mismatches = self.validator.validate(ir_path, target_module)
         except ValidationError as e:
             raise CorrectionError(f"Validation failed: {e}")
 
         if not mismatches:
             return {"corrected": 0, "total": 0}
 
-        try:
-            with open(ir_path) as f:
-                ir_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            raise CorrectionError(f"Cannot read IR file: {e}")
+        # Index cases by id once (first occurrence wins) instead of scanning per mismatch
+        cases_by_id = {}
+        for case in ir_data["cases"]:
+            cases_by_id.setdefault(case["id"], case)
 
         corrections = 0
         for mismatch in mismatches:
-            case_id = mismatch["case_id"]
-            for case in ir_data["cases"]:
-                if case["id"] == case_id:
-                    case["expectation"] = self._create_expectation(mismatch["actual"])
-                    corrections += 1
-                    break
+            case = cases_by_id.get(mismatch["case_id"])
+            if case is not None:
+                case["expectation"] = self._create_expectation(mismatch["actual"])
+                corrections += 1
 
         output = output_path or ir_path
         try:
-            with open(output, "w") as f:
-                json.dump(ir_data, f, indent=2)
+            _dump_ir(ir_data, Path(output))
         except IOError as e:
             raise CorrectionError(f"Cannot write corrected IR: {e}")
 
@@ -1,58 +1,60 @@
 """Generate run manifest for determinism and reproducibility."""
 
 import json
+import os
 import sys
 import hashlib
+import functools
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 def get_git_info():
     """Get git commit hash if in a git repository."""
     try:
-        commit = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        branch = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        dirty = subprocess.run(
-            ["git", "status", "--porcelain"],
+        # Single porcelain v2 call reports commit, branch and dirty state together
+        status = subprocess.run(
+            ["git", "status", "--branch", "--porcelain=v2"],
             capture_output=True,
             text=True,
             timeout=2
         )
-
-        return {
-            "commit": commit.stdout.strip() if commit.returncode == 0 else None,
-            "branch": branch.stdout.strip() if branch.returncode == 0 else None,
-            "dirty": bool(dirty.stdout.strip()) if dirty.returncode == 0 else None
-        }
     except (subprocess.TimeoutExpired, FileNotFoundError):
         return {"commit": None, "branch": None, "dirty": None}
 
+    if status.returncode != 0:
+        return {"commit": None, "branch": None, "dirty": None}
+
+    commit = None
+    branch = None
+    dirty = False
+    for line in status.stdout.splitlines():
+        if line.startswith("# branch.oid "):
+            oid = line[len("# branch.oid "):]
+            commit = oid if oid != "(initial)" else None
+        elif line.startswith("# branch.head "):
+            head = line[len("# branch.head "):]
+            branch = head if head != "(detached)" else "HEAD"
+        elif line and not line.startswith("#"):
+            dirty = True
+
+    return {"commit": commit, "branch": branch, "dirty": dirty}
 
+
+@functools.lru_cache(maxsize=1)
 def get_tool_versions():
-    """Get versions of key tools."""
+    """Get versions of key tools (cached, versions are fixed for the process)."""
     versions = {}
 
-    try:
-        python_version = subprocess.run(
-            [sys.executable, "--version"],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        versions["python"] = python_version.stdout.strip()
-    except:
-        versions["python"] = None
+    versions["python"] = f"Python {sys.version.split()[0]}"
 
     # Get package versions
     try:
@@ -76,16 +78,49 @@ def get_tool_versions():
     return versions
 
 
+# Checksums are reproducibility metadata, not signatures, so a fast non-SHA hash is fine
+CHECKSUM_ALGORITHM = "blake2b_256"
+
+
+def _new_checksum():
+    return hashlib.blake2b(digest_size=32)
+
+
 def compute_file_checksum(file_path: Path) -> str:
-    """Compute SHA256 checksum of a file."""
+    """Compute BLAKE2b-256 checksum of a file."""
     if not file_path.exists():
         return None
 
-    sha256 = hashlib.sha256()
     with open(file_path, 'rb') as f:
+        # file_digest streams the file inside the C layer (Python 3.11+)
+        if sys.version_info >= (3, 11):
+            return hashlib.file_digest(f, _new_checksum).hexdigest()
+
+        checksum = _new_checksum()
         for chunk in iter(lambda: f.read(8192), b''):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def compute_file_checksums(paths: dict) -> dict:
+    """Compute checksums for several files concurrently.
+
+    hashlib releases the GIL while hashing, so threads overlap disk reads and digest work.
+    """
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        return dict(zip(paths, executor.map(compute_file_checksum, paths.values())))
+
+
+def write_file_bytes(path: Path, data: bytes):
+    """Write data to path through a raw file descriptor, creating parent dirs."""
+    os.makedirs(path.parent, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 def generate_manifest(project_dir: Path, output_path: Path):
@@ -99,12 +134,13 @@ def generate_manifest(project_dir: Path, output_path: Path):
             "python_executable": sys.executable,
             "platform": sys.platform
         },
-        "files": {
-            "ir_json": compute_file_checksum(project_dir / "outputs" / "ir.json"),
-            "division_py": compute_file_checksum(project_dir / "examples" / "division.py"),
-            "generated_tests_py": compute_file_checksum(project_dir / "outputs" / "generated_tests.py"),
-            "ir_schema_json": compute_file_checksum(project_dir / "schemas" / "ir_schema.json")
-        },
+        "checksum_algorithm": CHECKSUM_ALGORITHM,
+        "files": compute_file_checksums({
+            "ir_json": project_dir / "outputs" / "ir.json",
+            "division_py": project_dir / "examples" / "division.py",
+            "generated_tests_py": project_dir / "outputs" / "generated_tests.py",
+            "ir_schema_json": project_dir / "schemas" / "ir_schema.json"
+        }),
         "config": {
             "random_seed": None,  # Placeholder for future use
             "model_name": "claude-sonnet-4-5-20250929"  # Could be parameterized
@@ -117,9 +153,11 @@ def generate_manifest(project_dir: Path, output_path: Path):
         }
     }
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, 'w') as f:
-        json.dump(manifest, f, indent=2)
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(manifest, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(manifest, indent=2).encode()
+    write_file_bytes(output_path, data)
 
     print(f"✓ Generated run manifest: {output_path}")
     return manifest
@@ -1,18 +1,30 @@
 """Generate human-readable summary from test results."""
 
 import json
+import re
 import sys
+import itertools
 from pathlib import Path
 from datetime import datetime
 
+from manifest_generator import write_file_bytes
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_FAILED_RE = re.compile(r"^.*FAILED.*$", re.MULTILINE)
+
 
 def generate_summary(report_path: Path, ir_path: Path, output_path: Path):
     """Generate concise human-readable summary."""
 
     # Load report
     try:
-        with open(report_path) as f:
-            report = json.load(f)
+        with open(report_path, 'rb') as f:
+            report = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
     except (FileNotFoundError, json.JSONDecodeError) as e:
         return f"Error: Could not read report: {e}"
 
@@ -27,6 +39,12 @@ def generate_summary(report_path: Path, ir_path: Path, output_path: Path):
     total = counts.get("total", 0)
     passed = counts.get("passed", 0)
     failed = counts.get("failed", 0)
+    cases = report.get("cases", [])
+    pass_rate = 100.0 * passed / total if total else 0.0
+
+    # Top 5 failing case ids; the scan stops as soon as five are found
+    failing_cases = (c for c in cases if not c.get("passed", False))
+    failing_ids = [c["id"] for c in itertools.islice(failing_cases, 5)] if failed else []
 
     # Determine diagnosis
     if failed == 0:
@@ -34,9 +52,6 @@ def generate_summary(report_path: Path, ir_path: Path, output_path: Path):
         status = "PASS"
     else:
         # Check if failures look like IR issues or code bugs
-        failing_cases = [c for c in report.get("cases", []) if not c.get("passed", False)]
-        failing_ids = [c["id"] for c in failing_cases[:5]]  # Top 5
-
         # Simple heuristic: if all tests fail, likely IR issue
         if failed == total:
             diagnosis = "⚠ All tests failed - likely IR specification issue"
@@ -51,13 +66,17 @@ def generate_summary(report_path: Path, ir_path: Path, output_path: Path):
     # Extract top traceback if available
     stdout = report.get("stdout", "")
     traceback_lines = []
-    if "FAILED" in stdout:
-        lines = stdout.split("\n")
-        for i, line in enumerate(lines):
-            if "FAILED" in line and i + 1 < len(lines):
-                # Get next few lines after FAILED
-                traceback_lines = lines[i:min(i+5, len(lines))]
+    match = _FAILED_RE.search(stdout)
+    if match and match.end() < len(stdout):
+        # Get the FAILED line plus the next two lines without splitting all of stdout
+        end = match.end()
+        for _ in range(2):
+            next_end = stdout.find("\n", end + 1)
+            if next_end < 0:
+                end = len(stdout)
                 break
+            end = next_end
+        traceback_lines = stdout[match.start():end].split("\n")
 
     # Build summary
     summary = f"""# Test Summary Report
@@ -69,15 +88,13 @@ def generate_summary(report_path: Path, ir_path: Path, output_path: Path):
 - **Total**: {total} tests
 - **Passed**: {passed} ✓
 - **Failed**: {failed} ✗
-- **Pass Rate**: {(passed/total*100) if total > 0 else 0:.1f}%
+- **Pass Rate**: {pass_rate:.1f}%
 
 ## Diagnosis
 {diagnosis}
 """
 
     if failed > 0:
-        failing_cases = [c for c in report.get("cases", []) if not c.get("passed", False)]
-        failing_ids = [c["id"] for c in failing_cases[:5]]
         summary += f"\n## Failing Tests (top 5)\n"
         for fid in failing_ids:
             summary += f"- `{fid}`\n"
@@ -89,8 +106,7 @@ def generate_summary(report_path: Path, ir_path: Path, output_path: Path):
 
     summary += f"\n---\n*Full details in pytest.json*\n"
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(summary)
+    write_file_bytes(output_path, summary.encode())
     print(f"✓ Generated summary: {output_path}")
 
 
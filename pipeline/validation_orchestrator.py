@@ -1,11 +1,101 @@
+import io
+import contextlib
 import json
+import hashlib
 import argparse
 import importlib
-import subprocess
+import importlib.util
+import os
 import sys
-import re
+import tempfile
+import py_compile
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Minimum number of cases before an IR marked "parallel": true runs them via pytest-xdist
+PARALLEL_MIN_CASES = 64
+
+# Special float string values and their Python source equivalents
+_SPECIAL = {"NaN": "float('nan')", "Infinity": "float('inf')", "-Infinity": "float('-inf')"}
+
+# Prefixes of Python expressions wrapped in strings (e.g., "float('inf')")
+_EXPR_PREFIXES = ("float(", "int(", "complex(")
+
+def load_json(data):
+    """Parse JSON bytes, preferring orjson when it is installed.
+
+    Falls back to the stdlib parser for non-standard tokens (e.g. bare NaN)
+    that orjson rejects but json accepts.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+def dump_json(obj, path):
+    """Write obj to path as indented JSON."""
+    if ORJSON_AVAILABLE:
+        Path(path).write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        Path(path).write_text(json.dumps(obj, indent=2))
+
+def source_hash(ir_bytes, formatted):
+    """Hash the IR together with this generator's source and the black setting.
+
+    Any change to the IR, the generator, or --format invalidates the generated file.
+    """
+    h = hashlib.blake2b(ir_bytes, digest_size=8)
+    h.update(Path(__file__).read_bytes())
+    h.update(b"black" if formatted else b"plain")
+    return h.hexdigest()
+
+def is_up_to_date(out_path, header):
+    """Return True if out_path was generated from the same inputs as header records."""
+    try:
+        with open(out_path) as f:
+            return f.readline() == header
+    except (FileNotFoundError, UnicodeDecodeError):
+        return False
+
+@contextlib.contextmanager
+def atomic_output(out_path):
+    """Yield a text stream whose contents replace out_path only once fully written.
+
+    The stream is a temp file in the same directory, so an interrupted run never
+    leaves a truncated file behind that still carries an up-to-date header.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(out_path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as out:
+            yield out
+        # mkstemp creates the file 0600; give it the mode a plain open() would
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+
+def format_source(src):
+    """Format src with black in-process; returns None if black is unavailable or fails."""
+    try:
+        import black
+    except ImportError:
+        return None
+    try:
+        return black.format_str(src, mode=black.Mode())
+    except black.InvalidInput:
+        return None
+
 def serialize_arg(arg):
     """Convert IR argument to Python source code expression.
 
@@ -17,47 +107,141 @@ def serialize_arg(arg):
         return repr(arg)
 
     # Handle special float string values
-    if arg == "NaN":
-        return "float('nan')"
-    if arg == "Infinity":
-        return "float('inf')"
-    if arg == "-Infinity":
-        return "float('-inf')"
+    special = _SPECIAL.get(arg)
+    if special is not None:
+        return special
 
-    # Pattern for Python expressions wrapped in strings (e.g., "float('inf')")
-    expr_pattern = r"^(float|int|complex)\(['\"]?.*['\"]?\)$"
-
-    if re.match(expr_pattern, arg):
+    if arg.startswith(_EXPR_PREFIXES) and arg.endswith(")"):
         return arg  # Emit as expression
 
     return repr(arg)  # Emit as string literal
 
-def generate_test(idx, target, case):
+class OutcomeCollector:
+    """pytest plugin recording pass/fail per test node as reports arrive.
+
+    pytest rewrites some param ids (duplicates become dup0/dup1, non-ASCII is
+    escaped), so outcomes are matched to cases by collection order, which follows
+    CASES, rather than by a rebuilt test name.
+    """
+
+    def __init__(self):
+        self.results = {}
+        self.order = []
+
+    def pytest_collection_finish(self, session):
+        self.order = [item.nodeid for item in session.items]
+
+    def pytest_runtest_logreport(self, report):
+        # The call phase decides the outcome; setup/teardown only matter when they fail
+        if report.when == "call" or report.failed:
+            self.results[report.nodeid] = report.passed and self.results.get(report.nodeid, True)
+
+    def outcomes(self, count):
+        """Return pass/fail for count cases in CASES order; all failed if collection did not match."""
+        if len(self.order) != count:
+            return [False] * count
+        return [self.results.get(nodeid, False) for nodeid in self.order]
+
+class XdistOutcomeCollector(OutcomeCollector):
+    """OutcomeCollector for pytest-xdist runs, where tests are collected in the workers."""
+
+    def pytest_xdist_node_collection_finished(self, node, ids):
+        self.order = list(ids)
+
+# Single parametrized test dispatching on the expectation kind of each case
+_TEST_CASE_SRC = """
+@pytest.mark.parametrize("args,kind,expv", CASES)
+def test_case(args, kind, expv):
+    if kind == "raises":
+        with pytest.raises(expv):
+            F(*args)
+    elif kind == "equals":
+        expected, tol = expv
+        if tol is None:
+            assert F(*args) == expected
+        else:
+            assert abs(F(*args) - expected) <= tol
+    else:
+        assert expv(F(*args))
+"""
+
+def case_param(idx, case):
+    """Return (case_id, param_src) for a single IR case.
+
+    param_src is the Python source of the pytest.param entry for the case,
+    holding its args, expectation kind and expected value.
+    """
     args = case["call"].get("args", [])
     args_src = ", ".join(serialize_arg(arg) for arg in args)
+    args_src = f"({args_src},)" if len(args) == 1 else f"({args_src})"
     case_id = case.get("id", f"case{idx}")
     exp = case["expectation"]
 
     if "raises" in exp:
         types = exp["raises"].get("types", [exp["raises"]]) if isinstance(exp["raises"], dict) else [exp["raises"]]
-        body = f"with pytest.raises({types[0]}):\n        f({args_src})"
+        kind, expv_src = "raises", types[0]
     elif "equals" in exp:
         expected_value = exp['equals']['value']
         tolerance = exp['equals'].get('tolerance')
-        if tolerance is not None and tolerance > 0:
-            body = f"assert abs(f({args_src}) - {repr(expected_value)}) <= {tolerance}"
-        else:
-            body = f"assert f({args_src}) == {repr(expected_value)}"
+        if tolerance is None or tolerance <= 0:
+            tolerance = None
+        kind, expv_src = "equals", f"({repr(expected_value)}, {repr(tolerance)})"
     elif "predicate" in exp:
-        pred_name = exp["predicate"]["name"]
-        body = f"assert {pred_name}(f({args_src}))"
+        kind, expv_src = "predicate", exp["predicate"]["name"]
     else:
         raise ValueError("Unsupported expectation")
 
-    return f"""def test_{case_id}():
-    f = _resolve_target("{target}")
-    {body}
-"""
+    return case_id, f"pytest.param({args_src}, {kind!r}, {expv_src}, id={case_id!r})"
+
+def write_test_source(out, header, target, params):
+    """Write the full test module source to the text stream out."""
+    out.write(header)
+    out.write(f"""import pytest
+import math
+from importlib import import_module
+
+def _resolve_target(target_spec):
+    module, func = target_spec.split(":", 1)
+    return getattr(import_module(module), func)
+
+F = _resolve_target("{target}")
+
+def isinstance_complex(value):
+    return isinstance(value, complex)
+
+CASES = [
+""")
+    for _, param_src in params:
+        out.write(f"    {param_src},\n")
+    out.write("]\n")
+    out.write(_TEST_CASE_SRC)
+
+def write_test_file(out_path, header, target, params, formatted):
+    """Generate, optionally format, and byte-compile the test module."""
+    if formatted:
+        # black needs the whole module, so buffer it before formatting in-process
+        buf = io.StringIO()
+        write_test_source(buf, header, target, params)
+        src = buf.getvalue()
+        formatted_src = format_source(src)
+        if formatted_src is not None:
+            src = formatted_src
+            print(f"✓ Formatted {out_path} with black")
+        with atomic_output(out_path) as out:
+            out.write(src)
+    else:
+        # Stream to disk without holding the whole source in memory
+        with atomic_output(out_path) as out:
+            write_test_source(out, header, target, params)
+
+    # Byte-compile the final source so a broken generator fails fast instead of
+    # surfacing as a pytest collection error; the file is removed so that the
+    # next run regenerates it rather than treating it as up to date
+    try:
+        py_compile.compile(out_path, doraise=True)
+    except py_compile.PyCompileError as e:
+        os.unlink(out_path)
+        sys.exit(f"Error: generated tests failed to compile: {e.msg}")
 
 def main():
     parser = argparse.ArgumentParser()
@@ -68,7 +252,8 @@ def main():
     parser.add_argument("--format", action="store_true", help="Format generated tests with black")
     args = parser.parse_args()
 
-    ir = json.loads(Path(args.in_path).read_text())
+    ir_bytes = Path(args.in_path).read_bytes()
+    ir = load_json(ir_bytes)
     target = ir.get("target", "division:divide")
     cases = ir.get("cases", [])
 
@@ -78,53 +263,44 @@ def main():
     if not cases:
         return
 
-    tests = [
-        """import pytest
-import math
-from importlib import import_module
-
-def _resolve_target(target_spec):
-    module, func = target_spec.split(":")
-    return getattr(import_module(module), func)
+    case_ids = [case.get("id", f"case{i}") for i, case in enumerate(cases)]
 
-def isinstance_complex(value):
-    return isinstance(value, complex)
-"""
-    ]
-    tests.extend(generate_test(i, target, case) for i, case in enumerate(cases))
-    test_content = "\n".join(tests)
-    Path(args.out_path).write_text(test_content)
-
-    # Format with black if requested
-    if args.format:
-        try:
-            result = subprocess.run(
-                [sys.executable, "-m", "black", "--quiet", args.out_path],
-                capture_output=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                print(f"✓ Formatted {args.out_path} with black")
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass  # black not available or timed out
+    # Skip regeneration (and black) when the file already matches this IR
+    header = f"# ir-hash: {source_hash(ir_bytes, args.format)}\n"
+    if is_up_to_date(args.out_path, header):
+        print(f"✓ {args.out_path} is up to date")
+    else:
+        # Every case becomes one pytest.param of a single parametrized test
+        params = [case_param(i, case) for i, case in enumerate(cases)]
+        write_test_file(args.out_path, header, target, params, args.format)
 
     result = {"target": target, "counts": {"total": len(cases), "passed": 0, "failed": 0}, "cases": []}
     if args.run:
-        proc = subprocess.run(
-            [sys.executable, "-m", "pytest", args.out_path, "-v", "--cov=examples.division", "--disable-warnings"],
-            text=True, capture_output=True
-        )
-        result["stdout"] = proc.stdout
-        result["stderr"] = proc.stderr
-        for i, case in enumerate(cases):
-            case_id = case.get("id", f"case{i}")
-            test_name = f"test_{case_id}"
-            passed = f"{test_name} PASSED" in proc.stdout
+        import pytest
+
+        # Run pytest in-process to avoid a second interpreter startup and re-imports;
+        # put the working directory on sys.path as `python -m pytest` would
+        if os.getcwd() not in sys.path:
+            sys.path.insert(0, os.getcwd())
+        stdout, stderr = io.StringIO(), io.StringIO()
+        collector = OutcomeCollector()
+        pytest_args = [args.out_path, "-v", "--cov=examples.division", "--disable-warnings"]
+        # Spread large opted-in suites across cores when pytest-xdist is installed;
+        # worker startup outweighs cheap targets, so case count alone never enables it
+        parallel = ir.get("parallel", False) and len(cases) >= PARALLEL_MIN_CASES
+        if parallel and importlib.util.find_spec("xdist") is not None:
+            pytest_args += ["-n", "auto"]
+            collector = XdistOutcomeCollector()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            pytest.main(pytest_args, plugins=[collector])
+        result["stdout"] = stdout.getvalue()
+        result["stderr"] = stderr.getvalue()
+        for case_id, passed in zip(case_ids, collector.outcomes(len(case_ids))):
             result["cases"].append({"id": case_id, "passed": passed})
             result["counts"]["passed"] += passed
             result["counts"]["failed"] += not passed
 
-    Path(args.report_path).write_text(json.dumps(result, indent=2))
+    dump_json(result, args.report_path)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file